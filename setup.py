@@ -48,8 +48,7 @@ setup(
     keywords='taxii taxii2 client json cti cyber threat intelligence',
     packages=find_packages(exclude=['*.test']),
     install_requires=[
-        'requests',
-        'six',
+        'requests>=2.27.0',
         'pytz',
     ],
     extras_require={
@@ -57,13 +56,19 @@ setup(
             'coverage',
             'pytest',
             'pytest-cov',
-            'responses',
+            'responses>=0.17.0',
             'tox',
         ],
         'docs': [
             'sphinx',
             'sphinx-prompt',
-        ]
+        ],
+        'orjson': [
+            'orjson>=3.4',
+        ],
+        'ujson': [
+            'ujson>=5.4.0',
+        ],
     },
     project_urls={
         'Documentation': 'https://taxii2client.readthedocs.io/',
@@ -1,11 +1,13 @@
 import datetime
+import enum
+import functools
+import json
 import logging
+import uuid
 
 import pytz
 import requests
 import requests.auth
-import requests.structures
-import six
 
 from . import DEFAULT_USER_AGENT, MEDIA_TYPE_TAXII_V20, MEDIA_TYPE_TAXII_V21
 from .exceptions import (
@@ -16,6 +18,79 @@ from .exceptions import (
 log = logging.getLogger(__name__)
 
 
+# JSON (de)serialization of TAXII payloads.  _json_loads() accepts bytes and
+# _json_dumps() returns UTF-8 encoded bytes, ready for a request body.
+#
+# Request bodies are always encoded by the rules of the json module, which is
+# what requests itself uses: non-str keys are converted to strings, values
+# which aren't JSON types (e.g. datetimes) raise TypeError, and NaN and
+# infinities, which aren't valid JSON, raise ValueError.  uuid.UUID and
+# enum.Enum values are the one extension, encoded as their string and value
+# respectively, since orjson always does that.
+def _json_default(obj):
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(type(obj).__name__)
+    )
+
+
+def _stdlib_json_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False,
+                      default=_json_default).encode("utf-8")
+
+
+# Available implementations, most preferred first: name -> (loads, dumps).
+# orjson is much faster on large bundles.  It decodes integers wider than 64
+# bits as floats, but STIX limits integers to +/-(2**53 - 1), so TAXII content
+# never gets near that.  ujson is used, where orjson wheels aren't available,
+# to parse responses only.  Its encoder also accepts e.g. Decimal values and
+# objects with a toDict() method, which the json module rejects, and that
+# can't be turned off.
+_JSON_BACKENDS = {}
+
+try:
+    import orjson
+
+    # Hand types the json module doesn't encode natively back to us, rather
+    # than encoding them in orjson's own way.  These options need orjson 3.4;
+    # an older one (e.g. installed for another package) is left unused.
+    _ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATACLASS |
+                       orjson.OPT_PASSTHROUGH_DATETIME |
+                       orjson.OPT_PASSTHROUGH_SUBCLASS)
+except (ImportError, AttributeError):
+    pass
+else:
+    def _orjson_dumps(obj):
+        try:
+            data = orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Non-str keys, integers wider than 64 bits, datetimes, ...: let
+            # the json module encode or reject these.
+            return _stdlib_json_dumps(obj)
+
+        # orjson writes NaN and infinities as null rather than refusing them.
+        # STIX content has no nulls, so re-encoding these bodies is rare.
+        if b"null" in data:
+            return _stdlib_json_dumps(obj)
+        return data
+
+    _JSON_BACKENDS["orjson"] = (orjson.loads, _orjson_dumps)
+
+try:
+    import ujson
+except ImportError:
+    pass
+else:
+    _JSON_BACKENDS["ujson"] = (ujson.loads, _stdlib_json_dumps)
+
+_JSON_BACKENDS["json"] = (json.loads, _stdlib_json_dumps)
+
+_json_loads, _json_dumps = next(iter(_JSON_BACKENDS.values()))
+
+
 def _format_datetime(dttm):
     """Convert a datetime object into a valid STIX timestamp string.
 
@@ -33,15 +108,15 @@ def _format_datetime(dttm):
         zoned = pytz.utc.localize(dttm)
     else:
         zoned = dttm.astimezone(pytz.utc)
-    ts = zoned.strftime("%Y-%m-%dT%H:%M:%S")
-    ms = zoned.strftime("%f")
+    # "YYYY-MM-DDTHH:MM:SS", without the "+00:00" UTC offset suffix
+    ts = zoned.isoformat(timespec="seconds")[:19]
     precision = getattr(dttm, "precision", None)
     if precision == "second":
         pass  # Already precise to the second
     elif precision == "millisecond":
-        ts = ts + "." + ms[:3]
+        ts = ts + ".{:03d}".format(zoned.microsecond // 1000)
     elif zoned.microsecond > 0:
-        ts = ts + "." + ms.rstrip("0")
+        ts = ts + "." + "{:06d}".format(zoned.microsecond).rstrip("0")
     return ts + "Z"
 
 
@@ -53,6 +128,59 @@ def _ensure_datetime_to_string(maybe_dttm):
     return maybe_dttm
 
 
+def _format_timestamp_param(arglist):
+    """Join timestamp filter values, converting datetimes to strings."""
+    return ",".join(_ensure_datetime_to_string(val) for val in arglist)
+
+
+def _format_added_after_param(arglist):
+    """Format the single-valued "added_after" filter."""
+    if len(arglist) > 1:
+        raise InvalidArgumentsError("No more than one value for filter"
+                                    " 'added_after' may be given")
+    return _format_timestamp_param(arglist)
+
+
+def _format_limit_param(arglist):
+    return int(arglist[0])
+
+
+def _format_next_param(arglist):
+    return arglist
+
+
+@functools.lru_cache(maxsize=64)
+def _match_param_name(kwarg):
+    """Name of the "match[<kwarg>]" query parameter for a filter keyword.
+    Callers reuse the same few filters, so the names are built only once."""
+    return "match[" + kwarg + "]"
+
+
+# Keywords which don't map to a plain "match[<kwarg>]" filter of joined
+# strings: kwarg -> (query parameter name, value formatter)
+_SPECIAL_QUERY_PARAMS = {
+    "version": ("match[version]", _format_timestamp_param),
+    "added_after": ("added_after", _format_added_after_param),
+    "limit": ("limit", _format_limit_param),
+    "next": ("next", _format_next_param),
+}
+
+
+def _query_param(kwarg, arglist):
+    """Map a single (non-empty) filter keyword and its value(s) to a
+    (query parameter name, query parameter value) pair."""
+    # force iterability, for the sake of code uniformity
+    if not hasattr(arglist, "__iter__") or isinstance(arglist, str):
+        arglist = arglist,
+
+    special = _SPECIAL_QUERY_PARAMS.get(kwarg)
+    if special is None:
+        return _match_param_name(kwarg), ",".join(arglist)
+
+    param, formatter = special
+    return param, formatter(arglist)
+
+
 def _filter_kwargs_to_query_params(filter_kwargs):
     """
     Convert API keyword args to a mapping of URL query parameters.  Except for
@@ -74,41 +202,20 @@ def _filter_kwargs_to_query_params(filter_kwargs):
             strings.
 
     """
-    query_params = {}
-    for kwarg, arglist in six.iteritems(filter_kwargs):
-        # If user passes an empty list, None, etc, silently skip?
-        if not arglist:
-            continue
-
-        # force iterability, for the sake of code uniformity
-        if not hasattr(arglist, "__iter__") or \
-                isinstance(arglist, six.string_types):
-            arglist = arglist,
-
-        if kwarg == "version":
-            query_params["match[version]"] = ",".join(
-                _ensure_datetime_to_string(val) for val in arglist
-            )
-
-        elif kwarg == "added_after":
-            if len(arglist) > 1:
-                raise InvalidArgumentsError("No more than one value for filter"
-                                            " 'added_after' may be given")
+    # If user passes an empty list, None, etc, silently skip?
+    return dict(
+        _query_param(kwarg, arglist)
+        for kwarg, arglist in filter_kwargs.items()
+        if arglist
+    )
 
-            query_params["added_after"] = ",".join(
-                _ensure_datetime_to_string(val) for val in arglist
-            )
 
-        elif kwarg == "limit":
-            query_params["limit"] = int(arglist[0])
-
-        elif kwarg == "next":
-            query_params["next"] = arglist
-
-        else:
-            query_params["match[" + kwarg + "]"] = ",".join(arglist)
-
-    return query_params
+@functools.lru_cache(maxsize=64)
+def _media_type_tokens(media_type):
+    """Split an Accept/Content-Type header value into its media type and
+    parameter tokens, ignoring whitespace.  A client only ever sees a handful
+    of distinct values, so the results are cached."""
+    return tuple(media_type.replace(" ", "").split(";"))
 
 
 def _to_json(resp):
@@ -120,13 +227,20 @@ def _to_json(resp):
     :return: Parsed JSON.
     :raises: InvalidJSONError If JSON parsing failed.
     """
+    try:
+        return _json_loads(resp.content)
+    except ValueError:
+        # The fast path only handles plain UTF-8; requests also copes with
+        # e.g. a leading byte order mark or UTF-16 encoded bodies.
+        pass
+
     try:
         return resp.json()
     except ValueError as e:
         # Maybe better to report the original request URL?
-        six.raise_from(InvalidJSONError(
+        raise InvalidJSONError(
             "Invalid JSON was received from " + resp.request.url
-        ), e)
+        ) from e
 
 
 def _grab_total_items_from_resource(resp):
@@ -232,8 +346,7 @@ class _HTTPConnection(object):
         """
         self.session = requests.Session()
         self.session.verify = verify
-        # enforce that we always have a connection-default user agent.
-        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        self.user_agent = user_agent
 
         if user and password:
             self.session.auth = requests.auth.HTTPBasicAuth(user, password)
@@ -246,6 +359,17 @@ class _HTTPConnection(object):
         if cert:
             self.session.cert = cert
 
+    @property
+    def user_agent(self):
+        return self._user_agent
+
+    @user_agent.setter
+    def user_agent(self, user_agent):
+        # enforce that we always have a connection-default user agent.
+        self._user_agent = user_agent or DEFAULT_USER_AGENT
+        # Built once here rather than on every request; see _merge_headers()
+        self._default_headers = {"user-agent": self._user_agent}
+
     def valid_content_type(self, content_type, accept):
         """Check that the server is returning a valid Content-Type
 
@@ -254,8 +378,8 @@ class _HTTPConnection(object):
             accept (str): media type to include in the ``Accept:`` header.
 
         """
-        accept_tokens = accept.replace(' ', '').split(';')
-        content_type_tokens = content_type.replace(' ', '').split(';')
+        accept_tokens = _media_type_tokens(accept)
+        content_type_tokens = _media_type_tokens(content_type)
 
         if self.version == "2.0":
             return (
@@ -290,9 +414,9 @@ class _HTTPConnection(object):
         else:
             media_type = MEDIA_TYPE_TAXII_V21
 
-        if "Accept" not in merged_headers:
-            merged_headers["Accept"] = media_type
-        accept = merged_headers["Accept"]
+        if "accept" not in merged_headers:
+            merged_headers["accept"] = media_type
+        accept = merged_headers["accept"]
 
         resp = self.session.get(url, headers=merged_headers, params=params)
 
@@ -318,7 +442,7 @@ class _HTTPConnection(object):
             )
             raise TAXIIServiceException(msg.format(content_type, accept))
 
-        if "Range" in merged_headers and self.version == "2.0":
+        if "range" in merged_headers and self.version == "2.0":
             return resp
         else:
             return _to_json(resp)
@@ -350,6 +474,23 @@ class _HTTPConnection(object):
             if kwarg not in ("json", "data"):
                 raise InvalidArgumentsError("Invalid kwarg: " + kwarg)
 
+        if kwargs.get("json") is not None:
+            # Serialize the body ourselves, rather than letting requests use
+            # the stdlib json module, so orjson is used if available.  Like
+            # requests, refuse NaN and infinities, which aren't valid JSON.
+            try:
+                body = _json_dumps(kwargs["json"])
+            except ValueError as e:
+                raise requests.exceptions.InvalidJSONError(e) from e
+
+            # Keys are lower-cased as in _merge_headers(), so a caller's
+            # Content-Type is found whatever its case.
+            headers = {
+                name.lower(): value for name, value in (headers or {}).items()
+            }
+            headers.setdefault("content-type", "application/json")
+            kwargs = {"data": body}
+
         resp = self.session.post(url, headers=headers, params=params, **kwargs)
         resp.raise_for_status()
         return _to_json(resp)
@@ -372,30 +513,28 @@ class _HTTPConnection(object):
 
         :param call_specific_headers: A header dict from the get/post call, or
             None (the default for those methods).
-        :return: A key-case-insensitive MutableMapping object which contains
-            the merged headers.  (This doesn't actually return a dict.)
+        :return: A dict which contains the merged headers, with all keys
+            lower-cased.
         """
 
-        # A case-insensitive mapping is necessary here so that there is
-        # predictable behavior.  If a plain dict were used, you'd get keys in
-        # the merged dict which differ only in case.  The requests library
-        # would merge them internally, and it would be unpredictable which key
-        # is chosen for the final set of headers.  Another possible approach
-        # would be to upper/lower-case everything, but this seemed easier.  On
-        # the other hand, I don't know if CaseInsensitiveDict is public API...?
+        # Keys are lower-cased so that there is predictable behavior.  If they
+        # were kept as given, you'd get keys in the merged dict which differ
+        # only in case.  The requests library would merge them internally,
+        # and it would be unpredictable which key is chosen for the final set
+        # of headers.  Lower-casing once here is also cheaper than a
+        # case-insensitive mapping, which folds case again on every lookup.
 
         # First establish defaults
-        merged_headers = requests.structures.CaseInsensitiveDict({
-            "User-Agent": self.user_agent
-        })
+        merged_headers = dict(self._default_headers)
 
         # Then overlay with specifics from post/get methods
         if call_specific_headers:
-            merged_headers.update(call_specific_headers)
+            for name, value in call_specific_headers.items():
+                merged_headers[name.lower()] = value
 
         # Special "User-Agent" header check, to ensure one is always sent.
         # The call-specific overlay could have null'd out that header.
-        if not merged_headers.get("User-Agent"):
-            merged_headers["User-Agent"] = self.user_agent
+        if not merged_headers.get("user-agent"):
+            merged_headers["user-agent"] = self.user_agent
 
         return merged_headers
@@ -4,7 +4,6 @@ import json
 import pytest
 import requests
 import responses
-import six
 
 from taxii2client import DEFAULT_USER_AGENT, MEDIA_TYPE_TAXII_V21
 from taxii2client.common import (
@@ -33,7 +32,7 @@ STATUS_ID = "2d086da7-4bdc-4f91-900e-d77486753710"
 STATUS_URL = API_ROOT_URL + "status/" + STATUS_ID + "/"
 
 # These responses are provided as examples in the TAXII 2.0 specification.
-DISCOVERY_RESPONSE = """{
+DISCOVERY_RESPONSE = b"""{
     "title": "Some TAXII Server",
     "description": "This TAXII Server contains a listing of...",
     "contact": "string containing contact information",
@@ -44,13 +43,13 @@ DISCOVERY_RESPONSE = """{
         "https://example.net/trustgroup1/"
     ]
 }"""
-API_ROOT_RESPONSE = """{
+API_ROOT_RESPONSE = b"""{
     "title": "Malware Research Group",
     "description": "A trust group setup for malware researchers",
     "versions": ["application/taxii+json;version=2.1"],
     "max_content_length": 9765625
 }"""
-COLLECTIONS_RESPONSE = """{
+COLLECTIONS_RESPONSE = b"""{
     "collections": [
         {
             "id": "91a7b528-80eb-42ed-a74d-c6fbd5a26116",
@@ -74,7 +73,7 @@ COLLECTIONS_RESPONSE = """{
         }
     ]
 }"""
-COLLECTION_RESPONSE = """{
+COLLECTION_RESPONSE = b"""{
     "id": "91a7b528-80eb-42ed-a74d-c6fbd5a26116",
     "title": "High Value Indicator Collection",
     "description": "This data collection is for collecting high value IOCs",
@@ -84,9 +83,10 @@ COLLECTION_RESPONSE = """{
         "application/stix+json;version=2.1"
     ]
 }"""
+COLLECTION_DICT = json.loads(COLLECTION_RESPONSE)
 
 # This collection is not in the spec.
-WRITABLE_COLLECTION = """{
+WRITABLE_COLLECTION = b"""{
     "id": "e278b87e-0f9b-4c63-a34c-c8f0b3e91acb",
     "title": "Writable Collection",
     "description": "This collection is a dropbox for submitting indicators",
@@ -96,6 +96,7 @@ WRITABLE_COLLECTION = """{
         "application/stix+json;version=2.1"
     ]
 }"""
+WRITABLE_COLLECTION_DICT = json.loads(WRITABLE_COLLECTION)
 
 STIX_OBJECT = """
 {
@@ -117,7 +118,8 @@ STIX_ENVELOPE = f"""{{
         {STIX_OBJECT}
     ]
 }}"""
-GET_OBJECTS_RESPONSE = STIX_ENVELOPE
+STIX_ENVELOPE_BYTES = STIX_ENVELOPE.encode("utf-8")
+GET_OBJECTS_RESPONSE = STIX_ENVELOPE_BYTES
 # get_object() still returns a bundle. In this case, the bundle has only one
 # object (the correct one.)
 GET_OBJECT_RESPONSE = GET_OBJECTS_RESPONSE
@@ -125,7 +127,7 @@ GET_OBJECT_RESPONSE = GET_OBJECTS_RESPONSE
 # This is the expected response when calling ADD_OBJECTS with the STIX_BUNDLE
 # above. There is only one object, and it was added successfully. This response
 # is not in the spec.
-ADD_OBJECTS_RESPONSE = """{
+ADD_OBJECTS_RESPONSE = b"""{
     "id": "350dae03-d2d8-4bd3-bc1d-8160589693e3",
     "status": "complete",
     "request_timestamp": "2016-11-02T12:34:34.12345Z",
@@ -142,7 +144,7 @@ ADD_OBJECTS_RESPONSE = """{
 
 # This is the response in Section 5.4 of the spec. It implies a larger
 # bundle than what is provided in the example.
-ADD_OBJECTS_RESPONSE_FROM_SPEC = """{
+ADD_OBJECTS_RESPONSE_FROM_SPEC = b"""{
     "id": "2d086da7-4bdc-4f91-900e-d77486753710",
     "status": "pending",
     "request_timestamp": "2016-11-02T12:34:34.12345Z",
@@ -158,7 +160,7 @@ ADD_OBJECTS_RESPONSE_FROM_SPEC = """{
 }"""
 
 
-GET_MANIFEST_RESPONSE = """{
+GET_MANIFEST_RESPONSE = b"""{
     "objects": [
         {
             "id": "indicator--29aba82c-5393-42a8-9edb-6a2cb1df070b",
@@ -175,7 +177,7 @@ GET_MANIFEST_RESPONSE = """{
     ]
 }"""
 
-STATUS_RESPONSE = """{
+STATUS_RESPONSE = b"""{
     "id": "2d086da7-4bdc-4f91-900e-d77486753710",
     "status": "pending",
     "request_timestamp": "2016-11-02T12:34:34.12345Z",
@@ -208,7 +210,7 @@ STATUS_RESPONSE = """{
     ]
 }"""
 
-BAD_DISCOVERY_RESPONSE = """{"title":"""
+BAD_DISCOVERY_RESPONSE = b"""{"title":"""
 
 
 @pytest.fixture
@@ -276,16 +278,16 @@ def api_root():
 @pytest.fixture
 def collection():
     """Default Collection object"""
-    # The collection response is needed to get information about the collection
-    set_collection_response()
-    return Collection(COLLECTION_URL)
+    # Populated up front, so tests don't need to mock the collection response
+    # before using it.  test_collection covers the lazy-loading path.
+    return Collection(COLLECTION_URL, collection_info=COLLECTION_DICT)
 
 
 @pytest.fixture
 def writable_collection():
     """Collection with 'can_write' set to 'true'."""
-    set_collection_response(WRITABLE_COLLECTION_URL, WRITABLE_COLLECTION)
-    return Collection(WRITABLE_COLLECTION_URL)
+    return Collection(WRITABLE_COLLECTION_URL,
+                      collection_info=WRITABLE_COLLECTION_DICT)
 
 
 @pytest.fixture
@@ -477,12 +479,14 @@ def test_api_root_collections(api_root):
     assert coll.can_write is False
     assert coll.media_types == [MEDIA_TYPE_STIX_V21]
 
-    collection_dict = json.loads(COLLECTION_RESPONSE)
-    assert coll._raw == collection_dict
+    assert coll._raw == COLLECTION_DICT
 
 
 @responses.activate
-def test_collection(collection):
+def test_collection():
+    set_collection_response()
+    collection = Collection(COLLECTION_URL)
+
     assert collection._loaded is False
     assert collection.id == "91a7b528-80eb-42ed-a74d-c6fbd5a26116"
     assert collection._loaded is True
@@ -493,8 +497,7 @@ def test_collection(collection):
     assert collection.can_write is False
     assert collection.media_types == [MEDIA_TYPE_STIX_V21]
 
-    collection_dict = json.loads(COLLECTION_RESPONSE)
-    assert collection._raw == collection_dict
+    assert collection._raw == COLLECTION_DICT
 
 
 def test_collection_unexpected_kwarg():
@@ -582,7 +585,7 @@ def test_add_object_to_collection_dict(writable_collection):
     responses.add(responses.POST, ADD_WRITABLE_OBJECTS_URL, ADD_OBJECTS_RESPONSE,
                   status=202, content_type=MEDIA_TYPE_TAXII_V21)
 
-    dict_bundle = json.load(six.StringIO(STIX_ENVELOPE))
+    dict_bundle = json.loads(STIX_ENVELOPE)
 
     status = writable_collection.add_objects(dict_bundle)
 
@@ -600,9 +603,7 @@ def test_add_object_to_collection_bin(writable_collection):
                   ADD_OBJECTS_RESPONSE, status=202,
                   content_type=MEDIA_TYPE_TAXII_V21)
 
-    bin_bundle = STIX_ENVELOPE.encode("utf-8")
-
-    status = writable_collection.add_objects(bin_bundle)
+    status = writable_collection.add_objects(STIX_ENVELOPE_BYTES)
 
     assert status.status == "complete"
     assert status.total_count == 1
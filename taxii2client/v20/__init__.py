@@ -1,25 +1,27 @@
 """Python TAXII 2.0 Client API"""
 from __future__ import unicode_literals
 
-import json
 import logging
 import re
 import time
+from urllib import parse as urlparse
 
 import requests.exceptions
-import six
-from six.moves.urllib import parse as urlparse
 
 from .. import MEDIA_TYPE_STIX_V20, MEDIA_TYPE_TAXII_V20
 from ..common import (
     _filter_kwargs_to_query_params, _grab_total_items_from_resource,
-    _TAXIIEndpoint, _to_json
+    _json_dumps, _TAXIIEndpoint, _to_json
 )
 from ..exceptions import AccessError, InvalidJSONError, ValidationError
 
 # Module-level logger
 log = logging.getLogger(__name__)
 
+# Matches the "items A-B/N", "items A-B/*", "items */N" and "items */*" forms
+# of the Content-Range header in a single pass.
+_CONTENT_RANGE_RE = re.compile(r"^items (?:(\d+)-(\d+)|\*)/(?:(\d+)|\*)$")
+
 
 def as_pages(func, start=0, per_request=0, *args, **kwargs):
     """Creates a generator for TAXII 2.0 endpoints that support pagination.
@@ -33,8 +35,9 @@ def as_pages(func, start=0, per_request=0, *args, **kwargs):
     Use args or kwargs to pass filter information or other arguments required to make the call.
     """
     resp = func(start=start, per_request=per_request, *args, **kwargs)
-    yield _to_json(resp)
-    total_obtained, total_available = _grab_total_items(resp)
+    bundle = _to_json(resp)
+    yield bundle
+    total_obtained, total_available = _grab_total_items(resp, bundle)
 
     if total_available > per_request and total_obtained != per_request and total_obtained != float("inf"):
         log.warning("TAXII Server Response with different amount of objects! Setting per_request=%s", total_obtained)
@@ -44,38 +47,35 @@ def as_pages(func, start=0, per_request=0, *args, **kwargs):
     while start < total_available:
 
         resp = func(start=start, per_request=per_request, *args, **kwargs)
-        yield _to_json(resp)
+        bundle = _to_json(resp)
+        yield bundle
 
-        total_in_request, total_available = _grab_total_items(resp)
+        total_in_request, total_available = _grab_total_items(resp, bundle)
         start += per_request
 
 
-def _grab_total_items(resp):
+def _grab_total_items(resp, bundle):
     """Extracts the total elements (from HTTP Header) available on the Endpoint making the request.
-    This is specific to TAXII 2.0"""
+    This is specific to TAXII 2.0. If the header is missing, the objects in the already parsed
+    ``bundle`` are counted instead."""
     try:
-        results = re.match(r"^items (\d+)-(\d+)/(\d+)$", resp.headers["Content-Range"])
-        if results:
-            return int(results.group(2)) - int(results.group(1)) + 1, int(results.group(3))
-
-        results = re.match(r"^items (\d+)-(\d+)/\*$", resp.headers["Content-Range"])
-        if results:
-            return int(results.group(2)) - int(results.group(1)) + 1, float("inf")
-
-        results = re.match(r"^items \*/\*$", resp.headers["Content-Range"])
+        results = _CONTENT_RANGE_RE.match(resp.headers["Content-Range"])
         if results:
-            return float("inf"), float("inf")
-
-        results = re.match(r"^items \*/(\d+)$", resp.headers["Content-Range"])
-        if results:
-            return float("inf"), int(results.group(1))
+            first, last, total = results.groups()
+            if first is None:
+                total_in_request = float("inf")
+            else:
+                total_in_request = int(last) - int(first) + 1
+            if total is None:
+                return total_in_request, float("inf")
+            return total_in_request, int(total)
     except (ValueError, IndexError) as e:
-        six.raise_from(InvalidJSONError(
+        raise InvalidJSONError(
             "Invalid Content-Range was received from " + resp.request.url
-        ), e)
+        ) from e
     except KeyError:
         log.warning("TAXII Server Response did not include 'Content-Range' header - results could be incomplete.")
-    return _grab_total_items_from_resource(resp), float("inf")
+    return _grab_total_items_from_resource(bundle), float("inf")
 
 
 class Status(_TAXIIEndpoint):
@@ -90,6 +90,10 @@ class Status(_TAXIIEndpoint):
     # than just getting them returned from Collection.add_objects(), and there
     # aren't other endpoints to call on the Status object.
 
+    # Checked in this order, so the first missing one is reported
+    _REQUIRED_PROPERTIES = ("id", "status", "total_count", "success_count",
+                            "failure_count", "pending_count")
+
     def __init__(self, url, conn=None, user=None, password=None, verify=True,
                  proxies=None, status_info=None, auth=None, cert=None):
         """Create an API root resource endpoint.
@@ -181,55 +185,30 @@ class Status(_TAXIIEndpoint):
     def _validate_status(self):
         """Validates Status information. Raises errors for required
         properties."""
-        if not self.id:
-            msg = "No 'id' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if not self.status:
-            msg = "No 'status' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.total_count is None:
-            msg = "No 'total_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.success_count is None:
-            msg = "No 'success_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.failure_count is None:
-            msg = "No 'failure_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.pending_count is None:
-            msg = "No 'pending_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.successes and len(self.successes) != self.success_count:
-            msg = "Found successes={}, but success_count={} in status '{}'"
-            raise ValidationError(msg.format(self.successes,
-                                             self.success_count,
-                                             self.id))
-
-        if self.pendings and len(self.pendings) != self.pending_count:
-            msg = "Found pendings={}, but pending_count={} in status '{}'"
-            raise ValidationError(msg.format(self.pendings,
-                                             self.pending_count,
-                                             self.id))
-
-        if self.failures and len(self.failures) != self.failure_count:
-            msg = "Found failures={}, but failure_count={} in status '{}'"
-            raise ValidationError(msg.format(self.failures,
-                                             self.failure_count,
-                                             self.id))
-
-        if (self.success_count + self.pending_count + self.failure_count !=
-                self.total_count):
+        for name in self._REQUIRED_PROPERTIES:
+            if getattr(self, name) in (None, ""):
+                msg = "No '{}' in Status for request '{}'"
+                raise ValidationError(msg.format(name, self.url))
+
+        success_count = self.success_count
+        pending_count = self.pending_count
+        failure_count = self.failure_count
+
+        for name, items, count_name, count in (
+                ("successes", self.successes, "success_count", success_count),
+                ("pendings", self.pendings, "pending_count", pending_count),
+                ("failures", self.failures, "failure_count", failure_count)):
+            if items and len(items) != count:
+                msg = "Found {}={}, but {}={} in status '{}'"
+                raise ValidationError(msg.format(name, items, count_name,
+                                                 count, self.id))
+
+        if success_count + pending_count + failure_count != self.total_count:
             msg = ("(success_count={} + pending_count={} + "
                    "failure_count={}) != total_count={} in status '{}'")
-            raise ValidationError(msg.format(self.success_count,
-                                             self.pending_count,
-                                             self.failure_count,
+            raise ValidationError(msg.format(success_count,
+                                             pending_count,
+                                             failure_count,
                                              self.total_count,
                                              self.id))
 
@@ -254,6 +233,9 @@ class Collection(_TAXIIEndpoint):
 
     """
 
+    # Checked in this order, so the first missing one is reported
+    _REQUIRED_PROPERTIES = ("id", "title", "can_read", "can_write")
+
     def __init__(self, url, conn=None, user=None, password=None, verify=True,
                  proxies=None, collection_info=None, auth=None, cert=None):
         """
@@ -363,21 +345,10 @@ class Collection(_TAXIIEndpoint):
     def _validate_collection(self):
         """Validates Collection information. Raises errors for required
         properties."""
-        if not self._id:
-            msg = "No 'id' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if not self._title:
-            msg = "No 'title' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self._can_read is None:
-            msg = "No 'can_read' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self._can_write is None:
-            msg = "No 'can_write' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
+        for name in self._REQUIRED_PROPERTIES:
+            if getattr(self, "_" + name) in (None, ""):
+                msg = "No '{}' in Collection for request '{}'"
+                raise ValidationError(msg.format(name, self.url))
 
         if self._id not in self.url:
             msg = "The collection '{}' does not match the url for queries '{}'"
@@ -413,7 +384,8 @@ class Collection(_TAXIIEndpoint):
         headers = {"Accept": accept}
 
         if per_request > 0:
-            headers["Range"] = "items={}-{}".format(start, (start + per_request) - 1)
+            items_range = "{}-{}".format(start, (start + per_request) - 1)
+            headers["Range"] = "items=" + items_range
 
         try:
             response = self._conn.get(self.objects_url, headers=headers, params=query_params)
@@ -421,7 +393,7 @@ class Collection(_TAXIIEndpoint):
             if per_request > 0:
                 # This is believed to be an error in TAXII 2.0
                 # http://docs.oasis-open.org/cti/taxii/v2.0/cs01/taxii-v2.0-cs01.html#_Toc496542716
-                headers["Range"] = "items {}-{}".format(start, (start + per_request) - 1)
+                headers["Range"] = "items " + items_range
                 response = self._conn.get(self.objects_url, headers=headers, params=query_params)
             else:
                 raise e
@@ -482,13 +454,12 @@ class Collection(_TAXIIEndpoint):
         }
 
         if isinstance(bundle, dict):
-            json_text = json.dumps(bundle, ensure_ascii=False)
-            data = json_text.encode("utf-8")
+            data = _json_dumps(bundle)
 
-        elif isinstance(bundle, six.text_type):
+        elif isinstance(bundle, str):
             data = bundle.encode("utf-8")
 
-        elif isinstance(bundle, six.binary_type):
+        elif isinstance(bundle, bytes):
             data = bundle
 
         else:
@@ -521,7 +492,8 @@ class Collection(_TAXIIEndpoint):
         headers = {"Accept": accept}
 
         if per_request > 0:
-            headers["Range"] = "items={}-{}".format(start, (start + per_request) - 1)
+            items_range = "{}-{}".format(start, (start + per_request) - 1)
+            headers["Range"] = "items=" + items_range
 
         try:
             response = self._conn.get(self.manifest_url, headers=headers, params=query_params)
@@ -529,7 +501,7 @@ class Collection(_TAXIIEndpoint):
             if per_request > 0:
                 # This is believed to be an error in TAXII 2.0
                 # http://docs.oasis-open.org/cti/taxii/v2.0/cs01/taxii-v2.0-cs01.html#_Toc496542716
-                headers["Range"] = "items {}-{}".format(start, (start + per_request) - 1)
+                headers["Range"] = "items " + items_range
                 response = self._conn.get(self.manifest_url, headers=headers, params=query_params)
             else:
                 raise e
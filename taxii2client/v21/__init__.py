@@ -1,17 +1,14 @@
 """Python TAXII 2.1 Client API"""
 from __future__ import unicode_literals
 
-import json
 import logging
 import time
-
-import six
-from six.moves.urllib import parse as urlparse
+from urllib import parse as urlparse
 
 from .. import MEDIA_TYPE_TAXII_V21
 from ..common import (
     _filter_kwargs_to_query_params, _grab_total_items_from_resource,
-    _TAXIIEndpoint
+    _json_dumps, _TAXIIEndpoint
 )
 from ..exceptions import AccessError, ValidationError
 
@@ -55,6 +52,10 @@ class Status(_TAXIIEndpoint):
     # than just getting them returned from Collection.add_objects(), and there
     # aren't other endpoints to call on the Status object.
 
+    # Checked in this order, so the first missing one is reported
+    _REQUIRED_PROPERTIES = ("id", "status", "total_count", "success_count",
+                            "failure_count", "pending_count")
+
     def __init__(self, url, conn=None, user=None, password=None, verify=True,
                  proxies=None, status_info=None, auth=None, cert=None):
         """Create an API root resource endpoint.
@@ -145,55 +146,30 @@ class Status(_TAXIIEndpoint):
     def _validate_status(self):
         """Validates Status information. Raises errors for required
         properties."""
-        if not self.id:
-            msg = "No 'id' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if not self.status:
-            msg = "No 'status' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.total_count is None:
-            msg = "No 'total_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.success_count is None:
-            msg = "No 'success_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.failure_count is None:
-            msg = "No 'failure_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.pending_count is None:
-            msg = "No 'pending_count' in Status for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self.successes and len(self.successes) != self.success_count:
-            msg = "Found successes={}, but success_count={} in status '{}'"
-            raise ValidationError(msg.format(self.successes,
-                                             self.success_count,
-                                             self.id))
-
-        if self.pendings and len(self.pendings) != self.pending_count:
-            msg = "Found pendings={}, but pending_count={} in status '{}'"
-            raise ValidationError(msg.format(self.pendings,
-                                             self.pending_count,
-                                             self.id))
-
-        if self.failures and len(self.failures) != self.failure_count:
-            msg = "Found failures={}, but failure_count={} in status '{}'"
-            raise ValidationError(msg.format(self.failures,
-                                             self.failure_count,
-                                             self.id))
-
-        if (self.success_count + self.pending_count + self.failure_count !=
-                self.total_count):
+        for name in self._REQUIRED_PROPERTIES:
+            if getattr(self, name) in (None, ""):
+                msg = "No '{}' in Status for request '{}'"
+                raise ValidationError(msg.format(name, self.url))
+
+        success_count = self.success_count
+        pending_count = self.pending_count
+        failure_count = self.failure_count
+
+        for name, items, count_name, count in (
+                ("successes", self.successes, "success_count", success_count),
+                ("pendings", self.pendings, "pending_count", pending_count),
+                ("failures", self.failures, "failure_count", failure_count)):
+            if items and len(items) != count:
+                msg = "Found {}={}, but {}={} in status '{}'"
+                raise ValidationError(msg.format(name, items, count_name,
+                                                 count, self.id))
+
+        if success_count + pending_count + failure_count != self.total_count:
             msg = ("(success_count={} + pending_count={} + "
                    "failure_count={}) != total_count={} in status '{}'")
-            raise ValidationError(msg.format(self.success_count,
-                                             self.pending_count,
-                                             self.failure_count,
+            raise ValidationError(msg.format(success_count,
+                                             pending_count,
+                                             failure_count,
                                              self.total_count,
                                              self.id))
 
@@ -218,6 +194,9 @@ class Collection(_TAXIIEndpoint):
 
     """
 
+    # Checked in this order, so the first missing one is reported
+    _REQUIRED_PROPERTIES = ("id", "title", "can_read", "can_write")
+
     def __init__(self, url, conn=None, user=None, password=None, verify=True,
                  proxies=None, collection_info=None, auth=None, cert=None):
         """
@@ -329,21 +308,10 @@ class Collection(_TAXIIEndpoint):
     def _validate_collection(self):
         """Validates Collection information. Raises errors for required
         properties."""
-        if not self._id:
-            msg = "No 'id' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if not self._title:
-            msg = "No 'title' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self._can_read is None:
-            msg = "No 'can_read' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
-
-        if self._can_write is None:
-            msg = "No 'can_write' in Collection for request '{}'"
-            raise ValidationError(msg.format(self.url))
+        for name in self._REQUIRED_PROPERTIES:
+            if getattr(self, "_" + name) in (None, ""):
+                msg = "No '{}' in Collection for request '{}'"
+                raise ValidationError(msg.format(name, self.url))
 
         if self._id not in self.url:
             msg = "The collection '{}' does not match the url for queries '{}'"
@@ -443,13 +411,12 @@ class Collection(_TAXIIEndpoint):
         }
 
         if isinstance(envelope, dict):
-            json_text = json.dumps(envelope, ensure_ascii=False)
-            data = json_text.encode("utf-8")
+            data = _json_dumps(envelope)
 
-        elif isinstance(envelope, six.text_type):
+        elif isinstance(envelope, str):
             data = envelope.encode("utf-8")
 
-        elif isinstance(envelope, six.binary_type):
+        elif isinstance(envelope, bytes):
             data = envelope
 
         else: